@@ -1,9 +1,10 @@
 import os
 import logging
+import zoneinfo
+import functools
 import logging.config as logging_config
 
-import pytz
-from sqlalchemy import create_engine
+from sqlalchemy import text, create_engine
 
 logging_config.fileConfig('logging.ini')
 logger = logging.getLogger(__name__)
@@ -11,13 +12,23 @@ logger = logging.getLogger(__name__)
 
 MAX_IDLE_DAYS = int(os.environ["MAX_IDLE_DAYS"])
 TIMEZONE = os.environ["TIMEZONE"]
-try:
-    pytz.timezone(TIMEZONE)
-except pytz.exceptions.UnknownTimeZoneError as e:
-    logger.error(
-        f"Incorrectly configured timezone. Must be one of {', '.join(pytz.all_timezones)}"
-    )
-    raise e
+
+
+def validate_config() -> None:
+    """
+    Runs the config checks that are too expensive for import time.
+    Called from the app entrypoint, so management scripts and workers
+    that never touch the checked settings don't pay for the validation
+    """
+    try:
+        zoneinfo.ZoneInfo(TIMEZONE)
+    except zoneinfo.ZoneInfoNotFoundError as e:
+        # the full timezone list is only built when the error actually fires
+        logger.error(
+            f"Incorrectly configured timezone. "
+            f"Must be one of {', '.join(sorted(zoneinfo.available_timezones()))}"
+        )
+        raise e
 
 # TODO collect stings from separate values
 BEAT_DB_CONN_STRING = os.environ["BEAT_DB_CONN_STRING"]
@@ -25,10 +36,68 @@ CORE_DB_CONN_STRING = os.environ["CORE_DB_CONN_STRING"]
 BROKER_CONN_STRING = os.environ["BROKER_CONN_STRING"]
 RESULT_BACKEND_CONN_STRING = os.environ["RESULT_BACKEND_CONN_STRING"]
 
-core_engine = create_engine(url=CORE_DB_CONN_STRING)
-schedule_engine = create_engine(url=BEAT_DB_CONN_STRING)
+def warm_pool(engine, n: int = None) -> None:
+    """
+    Opens and pings n pooled connections at once, so the TCP/TLS/auth handshakes
+    are paid at startup rather than by the first user requests after worker boot
+    """
+    if n is None:
+        n = getattr(engine.pool, "size", lambda: 1)()
+    connections = [engine.connect() for _ in range(n)]
+    for connection in connections:
+        connection.execute(text("SELECT 1"))
+    for connection in connections:
+        connection.close()
+
+
+WARM_POOL = os.environ.get("WARM_POOL", "1") == "1"
+
+
+def warm_pools() -> None:
+    """
+    Warms both engines' pools. Called explicitly from the app entrypoint
+    (next to validate_config), never at import time: a briefly unreachable
+    database should cost a logged warning and a slower first query, not an
+    import crash in every module that touches the engines
+    """
+    if not WARM_POOL:
+        return
+    for engine_factory in (core_engine, schedule_engine):
+        try:
+            warm_pool(engine_factory())
+        except Exception as e:
+            logger.warning(f"Couldn't warm the {engine_factory.__name__} pool.\nException: {e}")
+
+# Shared pool tuning for the long-lived bot and worker processes:
+# LIFO keeps a small hot set of connections in rotation (better server-side
+# plan-cache hit rate), pre_ping weeds out connections dropped by the server,
+# recycle caps a connection's lifetime.
+DB_POOL_SETTINGS = {
+    "pool_size": 10,
+    "max_overflow": 10,
+    "pool_timeout": 30,
+    "pool_recycle": 1800,
+    "pool_pre_ping": True,
+    "pool_use_lifo": True,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def core_engine():
+    """Builds the core db engine on first use, sparing the code paths that never need it"""
+    return create_engine(url=CORE_DB_CONN_STRING, query_cache_size=1200, **DB_POOL_SETTINGS)
+
+
+@functools.lru_cache(maxsize=None)
+def schedule_engine():
+    """Builds the beat scheduling db engine on first use, sparing the code paths that never need it"""
+    return create_engine(url=BEAT_DB_CONN_STRING, query_cache_size=1200, **DB_POOL_SETTINGS)
 
 TELEGRAM_BOT_TOKEN = os.environ["TELEGRAM_BOT_TOKEN"]
+# When set, the bot registers this public URL with Telegram and receives
+# updates over a webhook instead of long-polling getUpdates
+WEBHOOK_URL = os.environ.get("WEBHOOK_URL")
+WEBHOOK_PORT = int(os.environ.get("WEBHOOK_PORT", 8443))
 TEXT_FILEPATH = "text.ini"
 CRITICAL_ERROR_MSG = "Critical Server Error occurred. Please come back later!"
 
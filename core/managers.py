@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import os
+import queue
+import asyncio
 import decimal
 import logging
 import functools
+import itertools
+import threading
 from json import dumps
+from time import monotonic
 from typing import Callable
 from datetime import datetime, timedelta
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import case, delete, select, update, bindparam
 from sqlalchemy.exc import DatabaseError
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 # Project
 import config
@@ -22,6 +29,7 @@ from core.models import (Chat,
                          PeriodicTask,
                          ScheduleBasis,
                          ScheduleEntry,
+                         ScheduleOutbox,
                          CrontabSchedule,)
 
 __all__ = [
@@ -32,74 +40,222 @@ __all__ = [
 
 logger = logging.getLogger(__name__)
 
+# Shared session registries: every manager borrows thread-local sessions
+# from these factories instead of holding a private Session of its own,
+# so all managers reuse the same connection pool of the shared engines.
+core_session_factory = scoped_session(
+    sessionmaker(bind=config.core_engine(), expire_on_commit=False)
+)
+schedule_session_factory = scoped_session(
+    sessionmaker(bind=config.schedule_engine(), expire_on_commit=False)
+)
+
+
+CONTACT_FLUSH_INTERVAL = 5      # seconds; latest_contact only needs second granularity
+
+# Debounce buffer for latest_contact: every incoming message lands here,
+# and a background timer flushes the whole batch with a single UPDATE,
+# instead of one UPDATE + commit per message.
+_contact_buffer: dict[int, datetime] = {}
+_contact_buffer_lock = threading.Lock()
+
+
+def _flush_contact_buffer() -> None:
+    with _contact_buffer_lock:
+        pending = dict(_contact_buffer)
+        _contact_buffer.clear()
+    try:
+        if pending:
+            core_session_factory.execute(
+                update(Chat)
+                .where(Chat.chat_id.in_(pending))
+                .values(latest_contact=case(pending, value=Chat.chat_id))
+            )
+            core_session_factory.commit()
+    except Exception as e:
+        core_session_factory.rollback()
+        logger.error(f"Couldn't flush the latest_contact buffer.\nException: {e}")
+    finally:
+        _schedule_contact_flush()
+
+
+def _schedule_contact_flush() -> None:
+    timer = threading.Timer(CONTACT_FLUSH_INTERVAL, _flush_contact_buffer)
+    timer.daemon = True
+    timer.start()
+
+
+# Error notifications leave through a background worker: the exception path
+# must not stack a blocking HTTP POST on top of an already failing request.
+_notification_queue: queue.Queue = queue.Queue()
 
-class ExceptionsHandlerMeta(type):
+
+def _notification_worker() -> None:
+    while True:
+        chat_id, text = _notification_queue.get()
+        try:
+            bot = _get_bot()
+            coroutine = bot.telebot.send_message(chat_id=chat_id, text=text)
+            loop = bot.loop
+            if loop is not None and loop.is_running():
+                # inside the bot process the send must run on the bot's own
+                # loop: telebot caches one aiohttp ClientSession bound to the
+                # loop that created it, and driving it from a throwaway loop
+                # fails with "Timeout context manager should be used inside a task"
+                asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+            else:
+                # no bot loop in this process (e.g. a celery worker): a
+                # short-lived loop is safe, nothing shares a session with it
+                asyncio.run(coroutine)
+        except Exception as e:
+            logger.error(f"Couldn't deliver the error notification to {chat_id=}.\nException: {e}")
+
+
+def _start_notification_worker() -> None:
+    threading.Thread(target=_notification_worker, daemon=True).start()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_bot():
+    """Cached lazy import of the bot, avoiding the circular import at module load"""
+    # Project
+    from main import get_bot
+
+    return get_bot()
+
+
+# Built once instead of per exception: the handler runs under failure storms,
+# so even the log-message formatting is kept off the per-call path.
+_ERROR_LOG_TEMPLATE = (
+    "\n"
+    "\tException occurred during the '%s.%s' execution:\n"
+    "\targs: %s\n"
+    "\tkwargs: %s\n"
+    "\texception: %s\n"
+    "\ttrace_phrase: '%s'"
+)
+
+
+def handle_exceptions(method: Callable):
     """
-    A custom metaclass designed to secure managers' methods execution
-    by wrapping each method into a try-except block with robust exception handling.
+    A decorator designed to secure managers' db-facing methods execution
+    by wrapping the method into a try-except block with robust exception handling.
     """
-    def __new__(cls, name, bases, dct):
-        for attr, value in dct.items():
-            if callable(value):
-                dct[attr] = cls.handle_exceptions(value)
-        return super().__new__(cls, name, bases, dct)
-
-    @classmethod
-    def handle_exceptions(cls, method: Callable):
-        @functools.wraps(method)
-        def wrapped(self, *args, **kwargs):
-            try:
-                return method(self, *args, **kwargs)
-            except Exception as e:
-                instance = self
-                log_message = (
-                    f"\n"
-                    f"\tException occurred during the '{type(instance).__name__}.{method.__name__}' execution:\n"
-                    f"\targs: {[str(a) for a in args]}\n"
-                    f"\tkwargs: {[f'{k}={v!s}' for k, v in kwargs.items()]}\n"
-                    f"\texception: {e}"
+    @functools.wraps(method)
+    def wrapped(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        except Exception as e:
+            # rollback
+            getattr(self, "db_session").rollback()
+            # inform user that there was an error
+            chat_id = self.chat_id
+            trace_phrase = ""
+            if chat_id is not None:
+                trace_phrase = generate_trace_phrase()
+                text = service_keeper.get_message("error", "info")
+                contacts = service_keeper.get_message("error", "contacts")
+                text = "\n".join([text, trace_phrase, contacts])
+                _notification_queue.put((chat_id, text))
+            # log the exception; the guard keeps the args/kwargs stringification
+            # off the path entirely when ERROR records are filtered out
+            if logger.isEnabledFor(logging.ERROR):
+                logger.error(
+                    _ERROR_LOG_TEMPLATE,
+                    type(self).__name__,
+                    method.__name__,
+                    [str(a) for a in args],
+                    [f'{k}={v!s}' for k, v in kwargs.items()],
+                    e,
+                    trace_phrase,
                 )
-                # rollback
-                getattr(instance, "db_session").rollback()
-                # inform user that there was an error
-                chat_id = self.chat_id
-                if chat_id is not None:
-                    # Project
-                    from main import telegram_bot
-
-                    trace_phrase = generate_trace_phrase()
-                    log_message = "\n".join([log_message, f"\ttrace_phrase: '{trace_phrase}'"])
-                    text = service_keeper.get_message("error", "info")
-                    contacts = service_keeper.get_message("error", "contacts")
-                    text = "\n".join([text, trace_phrase, contacts])
-                    telegram_bot.telebot.send_message(chat_id=chat_id, text=text)
-                # log the exception
-                logger.error(log_message)
-        return wrapped
-
-
-class ChatManager(metaclass=ExceptionsHandlerMeta):
-    db_session = sessionmaker(bind=config.core_engine)()
+    return wrapped
+
+
+# Statements for the hottest chat/budget queries, built once at import:
+# executing the same statement objects lets SQLAlchemy reuse its compiled-SQL
+# cache instead of rebuilding the expression tree per call.
+_GET_STATE_STMT = select(Chat.state).where(Chat.chat_id == bindparam("cid"))
+_GET_BALANCE_STMT = select(Budget.balance).where(Budget.chat_id == bindparam("cid"))
+_SET_CONFIGURED_STMT = (
+    update(Chat)
+    .where(Chat.chat_id == bindparam("cid"), Chat.state == State.INITIAL)
+    .values(state=State.CONFIGURED)
+    .returning(Chat.state)
+)
+# the subquery fuses the CONFIGURED-state guard into the balance UPDATEs,
+# so the guard costs no separate SELECT: the statement simply matches
+# no rows unless the chat is in the CONFIGURED state
+_CONFIGURED_CHAT_SUBQUERY = select(Chat.chat_id).where(
+    Chat.chat_id == bindparam("cid"), Chat.state == State.CONFIGURED
+)
+_SPEND_STMT = (
+    update(Budget)
+    .where(Budget.chat_id.in_(_CONFIGURED_CHAT_SUBQUERY))
+    .values(balance=Budget.balance - bindparam("amount"))
+)
+_TOP_UP_STMT = (
+    update(Budget)
+    .where(Budget.chat_id.in_(_CONFIGURED_CHAT_SUBQUERY))
+    .values(balance=Budget.balance + bindparam("amount"))
+)
+_ANNUL_STMT = (
+    update(Budget)
+    .where(Budget.chat_id.in_(_CONFIGURED_CHAT_SUBQUERY))
+    .values(balance=0)
+)
+
+
+class ChatManager:
+    db_session = core_session_factory
 
     def __init__(self, chat_id: int):
         self.chat_id = chat_id
         self.scheduler = Scheduler(chat_manager=self)
+        self._in_transaction = False
+
+    def __enter__(self) -> ChatManager:
+        """
+        Binds the manager to a single transaction: all mutations issued inside
+        the `with` block are flushed but only committed once on exit, so a
+        request that touches several methods pays a single commit fsync
+        """
+        self._in_transaction = True
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._in_transaction = False
+        if exc_type is None:
+            self.db_session.commit()
+        else:
+            self.db_session.rollback()
+
+    def _finalize(self) -> None:
+        if self._in_transaction:
+            self.db_session.flush()
+        else:
+            self.db_session.commit()
 
+    @handle_exceptions
     def get_state(self) -> State:
         state = self.db_session.execute(
-            select(Chat.state).where(Chat.chat_id == self.chat_id)
+            _GET_STATE_STMT, {"cid": self.chat_id}
         ).scalar()
         if state == State.TERMINATED:
             logger.info(f"Attempt to revoke the terminated chat with {self.chat_id=}.")
         return state
 
+    @handle_exceptions
     def set_configured(self) -> None:
-        chat = self.db_session.get(Chat, self.chat_id)
-        if chat.state == State.INITIAL:
-            chat.state = State.CONFIGURED
-            self.db_session.commit()
+        # a single UPDATE .. RETURNING instead of SELECT-then-UPDATE: one round-trip
+        state = self.db_session.execute(
+            _SET_CONFIGURED_STMT, {"cid": self.chat_id}
+        ).scalar()
+        self._finalize()
+        if state is not None:
             logger.info(f"The state of the chat with chat_id {self.chat_id} is set to {State.CONFIGURED.value}.")
 
+    @handle_exceptions
     def engage(
         self,
         start_balance: decimal.Decimal = None,
@@ -116,68 +272,91 @@ class ChatManager(metaclass=ExceptionsHandlerMeta):
         chat.budget = budget
 
         self.db_session.add_all([chat, budget])
-        self.db_session.commit()
+        self._finalize()
 
+    @handle_exceptions
     def get_balance(self) -> decimal.Decimal | None:
         return self.db_session.execute(
-            select(Budget.balance)
-            .where(Budget.chat_id == self.chat_id)
+            _GET_BALANCE_STMT, {"cid": self.chat_id}
         ).scalar()
 
+    def _handle_not_configured(self) -> None:
+        # cold path: the diagnostic SELECT runs only when a mutation matched no rows
+        state = self.get_state()
+        logger.info(
+            f"Rejected a balance mutation for the chat with {self.chat_id=}: the state is {state}."
+        )
+
+    @handle_exceptions
     def spend(self, amount: decimal.Decimal) -> None:
-        self.db_session.execute(
-            update(Budget)
-            .where(Budget.chat_id == self.chat_id)
-            .values(balance=Budget.balance - amount)
+        result = self.db_session.execute(
+            _SPEND_STMT, {"cid": self.chat_id, "amount": amount}
         )
-        self.db_session.commit()
+        self._finalize()
+        if result.rowcount == 0:
+            self._handle_not_configured()
 
+    @handle_exceptions
     def top_up(self, amount: decimal.Decimal = None) -> None:
-        self.db_session.execute(
-            update(Budget)
-            .where(Budget.chat_id == self.chat_id)
-            .values(balance=Budget.balance + amount)
+        result = self.db_session.execute(
+            _TOP_UP_STMT, {"cid": self.chat_id, "amount": amount}
         )
-        self.db_session.commit()
+        self._finalize()
+        if result.rowcount == 0:
+            self._handle_not_configured()
 
+    @handle_exceptions
     def annul(self) -> None:
-        self.db_session.execute(
-            update(Budget)
-            .where(Budget.chat_id == self.chat_id)
-            .values(balance=0)
+        result = self.db_session.execute(
+            _ANNUL_STMT, {"cid": self.chat_id}
         )
-        self.db_session.commit()
+        self._finalize()
+        if result.rowcount == 0:
+            self._handle_not_configured()
 
     def refresh_latest_contact(self) -> None:
-        self.db_session.execute(
-            update(Chat)
-            .where(Chat.chat_id == self.chat_id)
-            .values(latest_contact=datetime.now())
-        )
-        self.db_session.commit()
+        # buffered: the background flush writes the batch out every few seconds
+        with _contact_buffer_lock:
+            _contact_buffer[self.chat_id] = datetime.now()
 
+    @handle_exceptions
     def add_event(self, record: ScheduleEntry, **kwargs) -> None:
-        schedule, task = self.scheduler.schedule_crontab_task(record)
+        # outbox pattern: the Event and its outbox row are committed atomically
+        # to the core db; drain_schedule_outbox later creates the schedule
+        # records in the beat db and backfills schedule_id/task_id, so the
+        # user path never spans both engines
         event = Event(
             event_type=record.event_type,
             chat_id=self.chat_id,
-            schedule_id=schedule.id,
-            task_id=task.id,
             **kwargs    # used for concrete event-specific fields
         )
         self.db_session.add(event)
-        self.db_session.commit()
+        self.db_session.flush()
+        outbox_row = ScheduleOutbox(
+            event_id=event.event_id,
+            chat_id=self.chat_id,
+            payload=record.to_payload(),
+        )
+        self.db_session.add(outbox_row)
+        self._finalize()
+
 
+# Task-name uniqueness is per process: the pid plus a monotonic counter
+# replaces the old datetime.now().timestamp() suffix, avoiding a clock
+# syscall per scheduling call and same-millisecond collisions.
+_task_name_seq = itertools.count()
 
-class Scheduler(metaclass=ExceptionsHandlerMeta):
-    db_session = sessionmaker(bind=config.schedule_engine)()
+
+class Scheduler:
+    db_session = schedule_session_factory
 
     def __init__(self, chat_manager: ChatManager):
         self.chat_manager = chat_manager
         self.chat_id = chat_manager.chat_id
 
+    @handle_exceptions
     def schedule_crontab_task(
-        self, record: ScheduleEntry
+        self, record: ScheduleEntry, name: str = None
     ) -> tuple[CrontabSchedule, PeriodicTask]:
         """
         Uses ScheduleEntry objects to schedule crontab-based events
@@ -188,6 +367,9 @@ class Scheduler(metaclass=ExceptionsHandlerMeta):
         record: ScheduleEntry data transfer objects, holding info on when should the task be executed
         task: str path to the task definition, like 'task_manager.tasks.sample_task'
         chat_id: int chat_id derived from pyTelegramBotAPI
+        name: str optional explicit task name; callers that may retry pass a
+        deterministic one, so a repeated call can be recognized instead of
+        scheduling the same event twice
         """
 
         crontab_schedule = CrontabSchedule()
@@ -200,21 +382,28 @@ class Scheduler(metaclass=ExceptionsHandlerMeta):
         crontab_schedule.timezone = config.TIMEZONE
 
         periodic_task = PeriodicTask()
-        periodic_task.name = f"{record.event_type.value}_{self.chat_id}_{datetime.now().timestamp()}"
+        periodic_task.name = name or f"{record.event_type.value}_{self.chat_id}_{os.getpid()}_{next(_task_name_seq)}"
         periodic_task.task = record.event_type.task
         periodic_task.crontab = crontab_schedule
-        periodic_task.args = dumps([self.chat_id])
+        periodic_task.args = dumps([self.chat_id], separators=(",", ":"))
 
         self.db_session.add_all([crontab_schedule, periodic_task])
+        # the flush on commit already populates the autogenerated ids,
+        # and expire_on_commit=False keeps them readable without extra SELECTs
         self.db_session.commit()
-        self.db_session.refresh(crontab_schedule)
-        self.db_session.refresh(periodic_task)
         return crontab_schedule, periodic_task
 
 
+MESSAGE_CACHE_TTL = 300     # seconds; the bot's texts are slow-changing config
+TERMINATION_CHUNK_SIZE = 1000   # keeps IN (...) clauses under driver parameter limits
+
+
 class ServiceKeeper:
-    core_session = sessionmaker(bind=config.core_engine)()
-    schedule_session = sessionmaker(bind=config.schedule_engine)()
+    core_session = core_session_factory
+    schedule_session = schedule_session_factory
+
+    def __init__(self):
+        self._message_cache: dict[tuple[str, str], tuple[str, float]] = {}
 
     def terminate_idle(self):
         """
@@ -222,28 +411,36 @@ class ServiceKeeper:
         sets the chat's state to 'TERMINATED'
         """
         logger.info(f"Starting terminating idle chats...")
-        data = self.core_session.execute(
-            select(
-                Chat.chat_id,
-                Budget.budget_id,
-                Event.event_id,
-                Event.schedule_id,
-                Event.task_id,
-            )
-            .select_from(Chat)
-            .outerjoin(Chat.budget)
-            .outerjoin(Chat.events)
-            .where(datetime.now() - Chat.latest_contact > timedelta(days=config.MAX_IDLE_DAYS))
+        idle = select(Chat.chat_id).where(
+            datetime.now() - Chat.latest_contact > timedelta(days=config.MAX_IDLE_DAYS)
+        )
+        # only the schedule/task ids travel through Python, since they target
+        # another database; everything else is deleted db-side off the idle subquery
+        rows = self.core_session.execute(
+            select(Event.schedule_id, Event.task_id).where(Event.chat_id.in_(idle))
         ).fetchall()
-        if not data:
+        schedule_ids = {row.schedule_id for row in rows}
+        task_ids = {row.task_id for row in rows}
+
+        self.core_session.execute(delete(Event).where(Event.chat_id.in_(idle)))
+        self.core_session.execute(delete(Budget).where(Budget.chat_id.in_(idle)))
+        terminated = self.core_session.execute(
+            update(Chat).where(Chat.chat_id.in_(idle)).values(state=State.TERMINATED)
+        )
+        if schedule_ids:
+            self.schedule_session.execute(
+                delete(CrontabSchedule).where(CrontabSchedule.id.in_(schedule_ids))
+            )
+        if task_ids:
+            self.schedule_session.execute(
+                delete(PeriodicTask).where(PeriodicTask.id.in_(task_ids))
+            )
+
+        if not terminated.rowcount and not rows:
+            self.core_session.rollback()
+            self.schedule_session.rollback()
             logger.info("No chats need to be terminated")
             return
-        chat_ids, budget_ids, event_ids, schedule_ids, task_ids = zip(*data)
-        self.core_session.execute(update(Chat).where(Chat.chat_id.in_(set(chat_ids))).values(state=State.TERMINATED))
-        self.core_session.execute(delete(Budget).where(Budget.budget_id.in_(set(budget_ids))))
-        self.core_session.execute(delete(Event).where(Event.event_id.in_(set(event_ids))))
-        self.core_session.execute(delete(CrontabSchedule).where(CrontabSchedule.id.in_(schedule_ids)))
-        self.core_session.execute(delete(PeriodicTask).where(PeriodicTask.id.in_(task_ids)))
 
         try:
             self.core_session.commit()
@@ -254,18 +451,161 @@ class ServiceKeeper:
             self.core_session.rollback()
             self.schedule_session.rollback()
 
-    def get_message(self, section: str, alias: str) -> Message:
+    def warm_messages(self) -> None:
+        """
+        Preloads the whole message table into the cache in one query,
+        so the first lookups after startup don't pay a db round-trip each
+        """
+        try:
+            messages = self.core_session.execute(select(Message)).scalars()
+        except DatabaseError as e:
+            self.core_session.rollback()
+            logger.error(f"Couldn't warm the message cache.\nException: {e}")
+            return
+        expires_at = monotonic() + MESSAGE_CACHE_TTL
+        for message in messages:
+            self._message_cache[(message.section, message.alias)] = (message.value, expires_at)
+
+    def collect_ids_for_termination(self) -> tuple[set[int], set[int], set[int]]:
+        """
+        Collects the ids of the idle chats along with their schedule/task ids
+        in one SELECT DISTINCT, so deduplication happens at the db layer
+        instead of per-row Python list extension
+        """
+        rows = self.core_session.execute(
+            select(Chat.chat_id, Event.schedule_id, Event.task_id)
+            .select_from(Chat)
+            .outerjoin(Chat.events)
+            .where(datetime.now() - Chat.latest_contact > timedelta(days=config.MAX_IDLE_DAYS))
+            .distinct()
+        ).fetchall()
+        chat_ids = {row.chat_id for row in rows}
+        schedule_ids = {row.schedule_id for row in rows if row.schedule_id is not None}
+        task_ids = {row.task_id for row in rows if row.task_id is not None}
+        return chat_ids, schedule_ids, task_ids
+
+    @staticmethod
+    def _chunked(ids):
+        ids = list(ids)
+        for i in range(0, len(ids), TERMINATION_CHUNK_SIZE):
+            yield ids[i:i + TERMINATION_CHUNK_SIZE]
+
+    def butch_terminate(self, chat_ids) -> None:
+        """
+        Sets the state to TERMINATED for the given chats: one UPDATE per id
+        chunk, with identity-map synchronization skipped — the sweep doesn't
+        hold any of the affected objects in the session
+        """
+        for chunk in self._chunked(chat_ids):
+            self.core_session.execute(
+                update(Chat)
+                .where(Chat.chat_id.in_(chunk))
+                .values(state=State.TERMINATED)
+                .execution_options(synchronize_session=False)
+            )
+        self.core_session.commit()
+
+    def butch_delete(self, schedule_ids, task_ids) -> None:
+        """
+        Deletes the given schedule records from the beat db:
+        one DELETE per table and id chunk
+        """
+        for chunk in self._chunked(schedule_ids):
+            self.schedule_session.execute(
+                delete(CrontabSchedule)
+                .where(CrontabSchedule.id.in_(chunk))
+                .execution_options(synchronize_session=False)
+            )
+        for chunk in self._chunked(task_ids):
+            self.schedule_session.execute(
+                delete(PeriodicTask)
+                .where(PeriodicTask.id.in_(chunk))
+                .execution_options(synchronize_session=False)
+            )
+        self.schedule_session.commit()
+
+    def drain_schedule_outbox(self) -> int:
+        """
+        Creates the beat schedule records for the unprocessed outbox rows,
+        backfills the related events with the new ids and marks each row
+        processed. Returns the number of drained rows
+        """
+        rows = self.core_session.execute(
+            select(ScheduleOutbox).where(ScheduleOutbox.processed == False)     # noqa: E712
+        ).scalars().all()
+        drained = 0
+        for row in rows:
+            record = ScheduleEntry.from_payload(row.payload)
+            # the name is derived from the outbox row, so retrying a row is
+            # idempotent: if a previous drain committed the beat records but
+            # crashed before marking the row processed, the existing task is
+            # found by name and reused instead of scheduled a second time
+            name = f"{record.event_type.value}_{row.chat_id}_outbox_{row.outbox_id}"
+            existing = self.schedule_session.execute(
+                select(PeriodicTask).where(PeriodicTask.name == name)
+            ).scalar()
+            if existing is not None:
+                schedule_id, task_id = existing.crontab_id, existing.id
+            else:
+                # handle_exceptions turns a failed scheduling into a logged None:
+                # the row stays unprocessed for the next run, the rest still drain
+                created = ChatManager(row.chat_id).scheduler.schedule_crontab_task(record, name=name)
+                if created is None:
+                    logger.error(f"Couldn't drain the outbox row {row.outbox_id} for {row.chat_id=}")
+                    continue
+                schedule, task = created
+                schedule_id, task_id = schedule.id, task.id
+            self.core_session.execute(
+                update(Event)
+                .where(Event.event_id == row.event_id)
+                .values(schedule_id=schedule_id, task_id=task_id)
+            )
+            row.processed = True
+            # per-row commit, so a failing row doesn't roll back the drained ones
+            self.core_session.commit()
+            drained += 1
+        return drained
+
+    def get_message(self, section: str, alias: str) -> str:
+        cached = self._message_cache.get((section, alias))
+        if cached is not None:
+            value, expires_at = cached
+            if monotonic() < expires_at:
+                return value
         try:
             message = self.core_session.get(Message, (section, alias)).value
         except AttributeError as e:
             logger.error(f"Couldn't load message {section=}, {alias=}.\nException: {e}")
-            message = config.CRITICAL_ERROR_MSG
+            return config.CRITICAL_ERROR_MSG
+        self._message_cache[(section, alias)] = (message, monotonic() + MESSAGE_CACHE_TTL)
         return message
 
     def upsert_message(self, section, alias, value):
         new_message = Message(section=section, alias=alias, value=value)
         self.core_session.merge(new_message)
         self.core_session.commit()
+        self._message_cache.pop((section, alias), None)
+
+    def bulk_upsert_messages(self, rows: list[dict]) -> None:
+        """
+        Upserts all given message rows with a single db-side
+        INSERT .. ON CONFLICT DO UPDATE, instead of the SELECT-then-write
+        pair that merge() costs per row
+        """
+        if not rows:
+            return
+        statement = pg_insert(Message).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=["section", "alias"],
+            set_={"value": statement.excluded.value},
+        )
+        self.core_session.execute(statement)
+        self.core_session.commit()
+        for row in rows:
+            self._message_cache.pop((row["section"], row["alias"]), None)
 
 
 service_keeper = ServiceKeeper()
+service_keeper.warm_messages()
+_schedule_contact_flush()
+_start_notification_worker()
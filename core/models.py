@@ -1,19 +1,20 @@
 from __future__ import annotations
 
+import sys
 import datetime
 from enum import Enum
+from json import dumps, loads
 from uuid import UUID, uuid4
 from typing import Annotated
 from decimal import Decimal
 
 from sqlalchemy import UUID as UUIDType
-from sqlalchemy import Integer, Numeric, ForeignKey, func, text
+from sqlalchemy import Index, Numeric, ForeignKey, func, text
 from sqlalchemy.orm import (Mapped,
+                            validates,
                             relationship,
-                            declared_attr,
                             mapped_column,
                             declarative_base,)
-from sqlalchemy.ext.declarative import AbstractConcreteBase
 from celery_sqlalchemy_scheduler.models import PeriodicTask, CrontabSchedule
 
 __all__ = [
@@ -26,6 +27,7 @@ __all__ = [
     "Chat",
     "Budget",
     "Message",
+    "ScheduleOutbox",
     "PeriodicTask",
     "CrontabSchedule",
 ]
@@ -33,8 +35,9 @@ __all__ = [
 Base = declarative_base()
 
 
-# enum
-class DayOfTheWeek(Enum):
+# enum; all inherit `str` so the db can roundtrip raw strings without
+# Enum wrapping, and membership checks hash the value directly
+class DayOfTheWeek(str, Enum):
     MONDAY = "MONDAY", 1, False
     TUESDAY = "TUESDAY", 2, False
     WEDNESDAY = "WEDNESDAY", 3, False
@@ -44,20 +47,25 @@ class DayOfTheWeek(Enum):
     SUNDAY = "SUNDAY", 7, True
 
     def __new__(cls, value, ordinal_number: int, is_weekend: bool = False):
-        obj = object.__new__(cls)
+        obj = str.__new__(cls, value)
         obj._value_ = value
         obj.ordinal_number = ordinal_number
         obj.is_weekend = is_weekend
         return obj
 
 
-class ScheduleBasis(Enum):
+_DOW_VALUES = tuple(day.value for day in DayOfTheWeek)
+_DOW_SET = frozenset(_DOW_VALUES)
+_VALID_MONTH_DAYS = frozenset(range(1, 32))
+
+
+class ScheduleBasis(str, Enum):
     DAILY = "DAILY"
     DAY_OF_THE_WEEK = "DAY_OF_THE_WEEK"
     DAY_OF_THE_MONTH = "DAY_OF_THE_MONTH"
 
 
-class EventType(Enum):
+class EventType(str, Enum):
     REPLENISHMENT = "REPLENISHMENT", "task_manager.celery_config.refill_balance_task", True
     ANNULMENT = "ANNULMENT", "task_manager.celery_config.annul_balance_task", True
     REMINDER = "REMINDER", "task_manager.celery_config.send_reminder_task", True
@@ -69,27 +77,31 @@ class EventType(Enum):
         model: Base,
         requires_chat_id: bool = False,
     ):
-        obj = object.__new__(cls)
+        obj = str.__new__(cls, value)
         obj._value_ = value
-        obj.task = task
+        obj.task = sys.intern(task)
         obj.model = model
         obj.requires_chat_id = requires_chat_id
         return obj
 
 
-class State(Enum):
+class State(str, Enum):
     INITIAL = "INITIAL"
     CONFIGURED = "CONFIGURED"
     TERMINATED = "TERMINATED"
 
 
-class AnnulmentCondition(Enum):
+class AnnulmentCondition(str, Enum):
     ...
     # TODO
 
 
 # dto
 class ScheduleEntry:
+    # short-lived and created per config step: slots skip the per-instance
+    # __dict__ and make attribute access a fixed-offset read
+    __slots__ = ("event_type", "basis", "time", "_day")
+
     def __init__(
         self,
         event_type: EventType,
@@ -112,6 +124,33 @@ class ScheduleEntry:
         if value is not None:
             self._validate_day()
 
+    def to_payload(self) -> str:
+        """Serializes the entry for the schedule outbox"""
+        return dumps(
+            {
+                "event_type": self.event_type.value,
+                "basis": self.basis.value if self.basis is not None else None,
+                "time": self.time.isoformat() if self.time is not None else None,
+                "day": self.day.value if isinstance(self.day, DayOfTheWeek) else self.day,
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_payload(cls, payload: str) -> ScheduleEntry:
+        """Restores an entry from its schedule-outbox serialization"""
+        data = loads(payload)
+        basis = ScheduleBasis(data["basis"]) if data["basis"] is not None else None
+        day = data["day"]
+        if basis == ScheduleBasis.DAY_OF_THE_WEEK and day is not None:
+            day = DayOfTheWeek(day)
+        return cls(
+            event_type=EventType(data["event_type"]),
+            basis=basis,
+            time=datetime.time.fromisoformat(data["time"]) if data["time"] is not None else None,
+            day=day,
+        )
+
     def _validate_day(self):
         match self.basis:
 
@@ -121,37 +160,42 @@ class ScheduleEntry:
                 )
 
             case ScheduleBasis.DAY_OF_THE_MONTH:
-                if not isinstance(self.day, int) or not 1 <= self.day <= 31:
+                # single hash lookup instead of an isinstance + range check
+                if self.day not in _VALID_MONTH_DAYS:
                     raise AttributeError(f"The 'day' must be an int, between 1 and 31")
 
             case ScheduleBasis.DAY_OF_THE_WEEK:
-                try:
-                    DayOfTheWeek(self.day)
-                except ValueError as e:
+                # single hash lookup instead of Enum.__call__
+                if self.day not in _DOW_SET:
                     raise AttributeError(
-                        f"The 'day' value must be one of {', '.join(DayOfTheWeek)}"
-                    ) from e
+                        f"The 'day' value must be one of {', '.join(_DOW_VALUES)}"
+                    )
 
 
 # orm
 class Chat(Base):
     __tablename__ = "chat"
     chat_id: Mapped[int] = mapped_column(primary_key=True)
+    # state and latest_contact are indexed for the idle-chat termination
+    # sweep, which filters on both every run
     state: Mapped[State] = mapped_column(
-        default=State.INITIAL, server_default=State.INITIAL.value
-    )
-    created_at: Mapped[datetime.datetime] = mapped_column(
-        default=datetime.datetime.now(),
-        server_default=text("CURRENT_TIMESTAMP"),
+        default=State.INITIAL, server_default=State.INITIAL.value, index=True
     )
+    # server-side timestamps: the database fills both columns on INSERT, so
+    # inserts ship no timestamp parameters and the clock source is the db's.
+    # latest_contact is refreshed only by the explicit refresh_latest_contact
+    # path — no onupdate, so unrelated UPDATEs (e.g. the termination sweep)
+    # don't bump it and resurrect idle chats
+    created_at: Mapped[datetime.datetime] = mapped_column(server_default=func.now())
     latest_contact: Mapped[datetime.datetime] = mapped_column(
-        default=datetime.datetime.now(),
-        server_default=text("CURRENT_TIMESTAMP"),
+        server_default=func.now(),
+        index=True,
     )
 
-    # relations
-    budget: Mapped[Budget] = relationship(back_populates="chat")
-    events: Mapped[list[Event]] = relationship(back_populates="chat")
+    # relations; eager strategies kill the per-chat N+1 on sweep queries:
+    # the budget folds into the parent query, the events load in one IN-batch
+    budget: Mapped[Budget] = relationship(back_populates="chat", lazy="joined")
+    events: Mapped[list[Event]] = relationship(back_populates="chat", lazy="selectin")
 
 
 money = Annotated[
@@ -166,7 +210,7 @@ class Budget(Base):
     __tablename__ = "budget"
     budget_id: Mapped[UUID] = mapped_column(
         primary_key=True,
-        default=uuid4(),
+        default=uuid4,
         server_default=func.gen_random_uuid(),
     )
     # We assign budgets to chats, rather than users, to allow using one budget in a group chat
@@ -178,72 +222,77 @@ class Budget(Base):
     chat: Mapped[Chat] = relationship(back_populates="budget")
 
 
-class Event(AbstractConcreteBase, Base):
-    strict_attrs = True
-
-    @declared_attr
-    def event_id(cls):
-        return mapped_column(
-            UUIDType,
-            primary_key=True,
-            default=uuid4(),
-            server_default=func.gen_random_uuid(),
-        )
-
-    @declared_attr
-    def chat_id(cls):
-        return mapped_column(
-            Integer,
-            ForeignKey(Chat.chat_id, onupdate="CASCADE", ondelete="CASCADE"),
-            nullable=False,
-        )
-
-    @declared_attr
-    def schedule_id(cls):
-        return mapped_column(Integer, nullable=False)
+class Event(Base):
+    """
+    Single-table inheritance root for the scheduled events: one physical
+    table with a discriminator instead of the previous concrete table per
+    subclass, which forced a UNION ALL whenever events were loaded
+    polymorphically and tripled the index count for the sweep queries
+    """
+    __tablename__ = "event"
+    event_id: Mapped[UUID] = mapped_column(
+        UUIDType,
+        primary_key=True,
+        default=uuid4,
+        server_default=func.gen_random_uuid(),
+    )
+    chat_id: Mapped[int] = mapped_column(
+        ForeignKey(Chat.chat_id, onupdate="CASCADE", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    event_type: Mapped[str] = mapped_column(index=True)
+    # nullable: filled in by the outbox drain once the schedule records exist
+    schedule_id: Mapped[int | None]
+    task_id: Mapped[int | None]
 
-    @declared_attr
-    def task_id(cls):
-        return mapped_column(Integer, nullable=False)
+    # subclass-specific fields, nullable by the nature of single-table inheritance
+    size: Mapped[Decimal | None] = mapped_column(Numeric(precision=10, scale=2))
+    silenced: Mapped[bool | None] = mapped_column(server_default="FALSE")
+    condition: Mapped[AnnulmentCondition | None] = mapped_column(default=None, server_default=text("NULL"))
 
     # relations
-    @declared_attr
-    def chat(cls):
-        return relationship(Chat, back_populates="events")
+    chat: Mapped[Chat] = relationship(back_populates="events")
 
+    __table_args__ = (Index("ix_event_chat_type", "chat_id", "event_type"),)
+    __mapper_args__ = {"polymorphic_on": "event_type"}
 
-class ReplenishmentEvent(Event):
-    __tablename__ = 'replenishment'
-    size: Mapped[money]
 
-    __mapper_args__ = {
-        'polymorphic_identity': EventType.REPLENISHMENT.value,
-        'concrete':True
-    }
+class ReplenishmentEvent(Event):
+    __mapper_args__ = {"polymorphic_identity": EventType.REPLENISHMENT.value}
 
 
 class ReminderEvent(Event):
-    __tablename__ = 'reminder'
-    silenced: Mapped[bool] = mapped_column(default=False, server_default="FALSE")
-
-    __mapper_args__ = {
-        'polymorphic_identity': EventType.REMINDER.value,
-        'concrete': True
-    }
+    __mapper_args__ = {"polymorphic_identity": EventType.REMINDER.value}
 
 
 class AnnulmentEvent(Event):
-    __tablename__ = 'annulment'
-    condition: Mapped[AnnulmentCondition | None] = mapped_column(default=None, server_default="NULL")
+    __mapper_args__ = {"polymorphic_identity": EventType.ANNULMENT.value}
+
 
-    __mapper_args__ = {
-        'polymorphic_identity': EventType.ANNULMENT.value,
-        'concrete': True
-    }
+class ScheduleOutbox(Base):
+    """
+    The outbox row for an Event: written atomically with the Event into the
+    core database and later drained into the beat scheduling database by a
+    background task. Keeps add_event within a single engine on the user path
+    and prevents orphaned schedule records when one of the two writes fails
+    """
+    __tablename__ = "schedule_outbox"
+    outbox_id: Mapped[int] = mapped_column(primary_key=True)
+    event_id: Mapped[UUID] = mapped_column(UUIDType, nullable=False)
+    chat_id: Mapped[int] = mapped_column(nullable=False)
+    payload: Mapped[str]
+    processed: Mapped[bool] = mapped_column(default=False, server_default="FALSE")
 
 
 class Message(Base):
     __tablename__ = "message"
     section: Mapped[str] = mapped_column(primary_key=True)
     alias: Mapped[str] = mapped_column(primary_key=True)
-    value: Mapped[str] = mapped_column(default="", server_default='')
\ No newline at end of file
+    value: Mapped[str] = mapped_column(default="", server_default='')
+
+    @validates("section", "alias")
+    def _intern_key(self, key, value):
+        # the same section/alias strings repeat across the whole table:
+        # interning collapses the duplicates and makes key lookups pointer-fast
+        return sys.intern(value)
\ No newline at end of file
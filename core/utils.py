@@ -1,16 +1,49 @@
+import pickle
+import configparser
+from pathlib import Path
+
 from faker import Faker
 
+# Project
+import config
+
+# Faker's constructor loads the whole locale provider registry (milliseconds),
+# while the word lookups below are microseconds — build it once per process
+_faker = Faker()
+
+
+def load_messages(filepath: str = None) -> list[dict]:
+    """
+    Parses the ini file with the bot's texts into row dicts suitable for
+    bulk insertion/upsertion. The parsed result is pickled next to the
+    source file and reused while the file's mtime is unchanged, so the
+    periodic reloads skip re-parsing an untouched file
+    """
+    filepath = Path(filepath or config.TEXT_FILEPATH)
+    cache_path = filepath.with_suffix(filepath.suffix + ".cache.pkl")
+    if cache_path.exists() and cache_path.stat().st_mtime >= filepath.stat().st_mtime:
+        with open(cache_path, "rb") as cache_file:
+            return pickle.load(cache_file)
+    parser = configparser.ConfigParser()
+    parser.read(filepath)
+    rows = [
+        {"section": section, "alias": option, "value": parser.get(section, option)}
+        for section in parser.sections()
+        for option in parser.options(section)
+    ]
+    with open(cache_path, "wb") as cache_file:
+        pickle.dump(rows, cache_file)
+    return rows
+
 
 def generate_trace_phrase():
     """
     Human-friendly trace phrase generator.
     Does not guarantee being unique, but can be memorized without copy-pasting
     """
-    faker = Faker()
-
-    subject_definition = faker.word(ext_word_list=None, part_of_speech="adjective")
-    subject = faker.word(ext_word_list=None, part_of_speech="noun")
-    predicate = faker.word(ext_word_list=None, part_of_speech="verb")
-    object_ = faker.word(ext_word_list=None, part_of_speech="noun")
+    subject_definition = _faker.word(ext_word_list=None, part_of_speech="adjective")
+    subject = _faker.word(ext_word_list=None, part_of_speech="noun")
+    predicate = _faker.word(ext_word_list=None, part_of_speech="verb")
+    object_ = _faker.word(ext_word_list=None, part_of_speech="noun")
 
     return f"{subject_definition} {subject} {predicate} {object_}"
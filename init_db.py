@@ -1,44 +1,67 @@
 import logging
-import configparser
 import logging.config as logging_config
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 
-from sqlalchemy import create_engine
+from sqlalchemy import func, insert, select
 from sqlalchemy.orm import sessionmaker
 from celery_sqlalchemy_scheduler.session import ModelBase as ScheduleBase
 
 # Project
 import config
+from core.utils import load_messages
 from core.models import Base as CoreBase
 from core.models import Message
 
 logging_config.fileConfig('logging.ini')
 logger = logging.getLogger(__name__)
 
+SEED_CHUNK_SIZE = 1000
+
+
+def chunks(iterable, size=SEED_CHUNK_SIZE):
+    """Yields lists of at most `size` items from `iterable`"""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def init_schedule_db():
+    logger.info("Initializing task_manager beat scheduling database...")
+    ScheduleBase.metadata.create_all(bind=config.schedule_engine())
+    logger.info("Tables successfully created")
+
+
+def init_core_db():
+    logger.info("Initializing core database...")
+    engine = config.core_engine()
+    CoreBase.metadata.create_all(bind=engine)
+    logger.info("Tables successfully created")
+    session = sessionmaker(bind=engine)()
+    if session.execute(select(func.count()).select_from(Message)).scalar():
+        logger.info("Message table already populated, skipping the seed")
+        return
+    text_filepath = config.TEXT_FILEPATH
+    logger.info(f"Filling the Core database with messages from {text_filepath}...")
+    # executemany INSERTs in bounded chunks: no per-row add() bookkeeping,
+    # and the statement parameters stay a fixed size however large the seed
+    rows = load_messages(text_filepath)
+    for chunk in chunks(rows):
+        session.execute(insert(Message), chunk)
+    session.commit()
+    logger.info(f"{len(rows)} Message db objects created")
+
 
 if __name__ == "__main__":
-    try:
-        logger.info("Initializing task_manager beat scheduling database...")
-        engine = create_engine(url=config.BEAT_DB_CONN_STRING)
-        ScheduleBase.metadata.create_all(bind=engine)
-        logger.info("Tables successfully created")
-    except Exception as e:
-        logger.error(f"Celery Beat scheduling database initialization failed.\n{e}")
-
-    try:
-        logger.info("Initializing core database...")
-        engine = create_engine(url=config.CORE_DB_CONN_STRING)
-        CoreBase.metadata.create_all(bind=engine)
-        logger.info("Tables successfully created")
-        text_filepath = config.TEXT_FILEPATH
-        logger.info(f"Filling the Core database with messages from {text_filepath}...")
-        session = sessionmaker(bind=engine)()
-        parser = configparser.ConfigParser()
-        parser.read(text_filepath)
-        for section in parser.sections():
-            for option in parser.options(section):
-                message = Message(section=section, alias=option, value=parser.get(section, option))
-                session.add(message)
-                logger.info(f"Message db object created. {section=}, alias='{option}'")
-        session.commit()
-    except Exception as e:
-        logger.error(f"Core database initialization failed.\n{e}")
+    # the two databases live on separate engines, so their DDL can run in
+    # parallel and the slower one no longer serializes behind the other
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = {
+            "Celery Beat scheduling": executor.submit(init_schedule_db),
+            "Core": executor.submit(init_core_db),
+        }
+        for name, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"{name} database initialization failed.\n{e}")
@@ -1,12 +1,24 @@
+import asyncio
+import functools
+
 # Project
 import config
 from telegram.bot import Bot
+from telegram.utils import warm_messages
 from telegram.mocker import Mocker
 
-telegram_bot = Mocker() if config.DEBUG else Bot(token=config.TELEGRAM_BOT_TOKEN)
+
+@functools.cache
+def get_bot() -> Bot:
+    """Builds the bot on first use, so importing main as a module costs nothing"""
+    return Mocker() if config.DEBUG else Bot(token=config.TELEGRAM_BOT_TOKEN)
+
 
 if __name__ == '__main__':
-    telegram_bot.listen_and_process()
+    config.validate_config()
+    config.warm_pools()
+    warm_messages()
+    asyncio.run(get_bot().listen_and_process())
 
 # TODO:
 # 1) desgin the message handler for on_duty
@@ -1,11 +1,13 @@
 import time
 import logging
-import configparser
+import functools
 
 import celery
+from celery.signals import task_postrun
 
 # Project
 import config
+from core.utils import load_messages
 from core.managers import ChatManager, service_keeper
 
 logger = logging.getLogger(__name__)
@@ -15,14 +17,37 @@ celery_app = celery.Celery(
     broker=config.BROKER_CONN_STRING,
     backend=config.RESULT_BACKEND_CONN_STRING,
 )
+DRAIN_OUTBOX_INTERVAL = 60.0    # seconds between schedule-outbox drains
+
 celery_app.conf.update(
     {
         "beat_dburi": config.BEAT_DB_CONN_STRING,
         "broker_connection_retry_on_startup": True,
+        # the scheduler installs these entries into the beat database on start
+        "beat_schedule": {
+            "drain-schedule-outbox": {
+                "task": "task_manager.celery_config.drain_schedule_outbox_task",
+                "schedule": DRAIN_OUTBOX_INTERVAL,
+            },
+        },
     }
 )
 
 
+@functools.lru_cache(maxsize=1024)
+def _manager_for(chat_id: int) -> ChatManager:
+    """One ChatManager per chat per worker process, instead of per task call"""
+    return ChatManager(chat_id)
+
+
+@task_postrun.connect
+def _expire_manager_sessions(**kwargs):
+    # cached managers share the scoped session; expiring it after each task
+    # keeps them from stale-reading values committed elsewhere
+    ChatManager.db_session.expire_all()
+
+
+
 @celery_app.task
 def terminate_idle_task():
     """
@@ -32,7 +57,6 @@ def terminate_idle_task():
     """
     logger.info("Starting terminate_idle_task...")
     time_start = time.time()
-    message_counter = 0
     chat_ids, schedule_ids, task_ids = service_keeper.collect_ids_for_termination()
     if chat_ids:
         service_keeper.butch_terminate(chat_ids)
@@ -40,7 +64,7 @@ def terminate_idle_task():
         service_keeper.butch_delete(schedule_ids, task_ids)
     logger.info(
         f"Finished executing terminate_idle_task. "
-        f"{message_counter} messages processed during {time.time() - time_start} seconds."
+        f"{len(chat_ids)} chats processed during {time.time() - time_start} seconds."
     )
 
 
@@ -52,19 +76,30 @@ def reload_messages_task():
     """
     logger.info("Starting reload_messages_task...")
     time_start = time.time()
-    message_counter = 0
-    parser = configparser.ConfigParser()
-    parser.read(config.TEXT_FILEPATH)
-    for section in parser.sections():
-        for option in parser.options(section):
-            service_keeper.upsert_message(section, option, parser.get(section, option))
-            message_counter += 1
+    rows = load_messages()
+    service_keeper.bulk_upsert_messages(rows)
+    message_counter = len(rows)
     logger.info(
         f"Finished executing reload_messages_task. "
         f"{message_counter} messages processed during {time.time() - time_start} seconds."
     )
 
 
+@celery_app.task
+def drain_schedule_outbox_task():
+    """
+    Drains the schedule outbox into the beat scheduling database.
+    Keeps the user-facing add_event path bound to a single database.
+    """
+    logger.info("Starting drain_schedule_outbox_task...")
+    time_start = time.time()
+    drained = service_keeper.drain_schedule_outbox()
+    logger.info(
+        f"Finished executing drain_schedule_outbox_task. "
+        f"{drained} outbox rows processed during {time.time() - time_start} seconds."
+    )
+
+
 @celery_app.task
 def send_reminder_task(chat_id):
     ...
@@ -74,13 +109,13 @@ def send_reminder_task(chat_id):
 
 @celery_app.task
 def refill_balance_task(chat_id: int):
-    manager = ChatManager(chat_id)
+    manager = _manager_for(chat_id)
     manager.top_up()
     logger.info(f"Balance refilled for {chat_id=}")
 
 
 @celery_app.task
 def annul_balance_task(chat_id: int):
-    manager = ChatManager(chat_id)
+    manager = _manager_for(chat_id)
     manager.annul()
     logger.info(f"The balance has been reset for {chat_id=}")
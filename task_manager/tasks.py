@@ -1,17 +1,21 @@
 import time
 import logging
-import configparser
+import functools
 from datetime import datetime, timedelta
 
 # Project
 import config
+from core.utils import load_messages
 from core.managers import ChatManager, service_keeper
 
+from celery.signals import task_postrun
+
 from . import celery_app
 
 __all__ = [
     "terminate_idle_task",
     "reload_messages_task",
+    "drain_schedule_outbox_task",
     "send_reminder_task",
     "refill_balance_task",
     "annul_balance_task",
@@ -20,6 +24,20 @@ __all__ = [
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1024)
+def _manager_for(chat_id: int) -> ChatManager:
+    """One ChatManager per chat per worker process, instead of per task call"""
+    return ChatManager(chat_id)
+
+
+@task_postrun.connect
+def _expire_manager_sessions(**kwargs):
+    # cached managers share the scoped session; expiring it after each task
+    # keeps them from stale-reading values committed elsewhere
+    ChatManager.db_session.expire_all()
+
+
+
 @celery_app.task
 def terminate_idle_task():
     """
@@ -29,7 +47,6 @@ def terminate_idle_task():
     """
     logger.info("Starting terminate_idle_task...")
     time_start = time.time()
-    message_counter = 0
     chat_ids, schedule_ids, task_ids = service_keeper.collect_ids_for_termination()
     if chat_ids:
         service_keeper.butch_terminate(chat_ids)
@@ -37,7 +54,7 @@ def terminate_idle_task():
         service_keeper.butch_delete(schedule_ids, task_ids)
     logger.info(
         f"Finished executing terminate_idle_task. "
-        f"{message_counter} messages processed during {time.time() - time_start} seconds."
+        f"{len(chat_ids)} chats processed during {time.time() - time_start} seconds."
     )
 
 
@@ -49,22 +66,33 @@ def reload_messages_task():
     """
     logger.info("Starting reload_messages_task...")
     time_start = time.time()
-    message_counter = 0
-    parser = configparser.ConfigParser()
-    parser.read(config.TEXT_FILEPATH)
-    for section in parser.sections():
-        for option in parser.options(section):
-            service_keeper.upsert_message(section, option, parser.get(section, option))
-            message_counter += 1
+    rows = load_messages()
+    service_keeper.bulk_upsert_messages(rows)
+    message_counter = len(rows)
     logger.info(
         f"Finished executing reload_messages_task. "
         f"{message_counter} messages processed during {time.time() - time_start} seconds."
     )
 
 
+@celery_app.task
+def drain_schedule_outbox_task():
+    """
+    Drains the schedule outbox into the beat scheduling database.
+    Keeps the user-facing add_event path bound to a single database.
+    """
+    logger.info("Starting drain_schedule_outbox_task...")
+    time_start = time.time()
+    drained = service_keeper.drain_schedule_outbox()
+    logger.info(
+        f"Finished executing drain_schedule_outbox_task. "
+        f"{drained} outbox rows processed during {time.time() - time_start} seconds."
+    )
+
+
 @celery_app.task
 def send_reminder_task(chat_id: int):
-    manager = ChatManager(chat_id)
+    manager = _manager_for(chat_id)
     if not manager.reminder_silenced:
         ...
         # TODO send reminder...
@@ -73,7 +101,7 @@ def send_reminder_task(chat_id: int):
 
 @celery_app.task
 def refill_balance_task(chat_id: int):
-    manager = ChatManager(chat_id)
+    manager = _manager_for(chat_id)
     manager.top_up()
     manager.reset_reminder()
     logger.info(f"Balance refilled for {chat_id=}")
@@ -81,6 +109,6 @@ def refill_balance_task(chat_id: int):
 
 @celery_app.task
 def annul_balance_task(chat_id: int):
-    manager = ChatManager(chat_id)
+    manager = _manager_for(chat_id)
     manager.annul()
     logger.info(f"The balance has been reset for {chat_id=}")
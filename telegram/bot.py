@@ -1,20 +1,81 @@
 from __future__ import annotations
 
+import re
+import asyncio
 import logging
 from enum import Enum
+from time import monotonic
 from decimal import Decimal
-from datetime import datetime
+from datetime import time
+from dataclasses import dataclass
 
 import telebot  # noqa
+from aiohttp import web
+from cachetools import TTLCache
+from telebot.async_telebot import AsyncTeleBot
 
 # Project
+import config
 from core.models import State, EventType, DayOfTheWeek, ScheduleBasis, ScheduleEntry
-from core.managers import ChatManager, service_keeper
-from telegram.utils import config_finished
+from core.managers import ChatManager
+from telegram.utils import _msg, config_finished
 
 logger = logging.getLogger(__name__)
 
 
+GLOBAL_SEND_RATE = 30           # Telegram's bot-wide cap, messages per second
+PER_CHAT_SEND_INTERVAL = 1.0    # Telegram's per-chat cap, seconds between messages
+SLOT_PURGE_INTERVAL = 60.0      # seconds between sweeps of expired per-chat slots
+MAX_SESSIONS = 50000            # upper bound on chats held in memory at once
+SESSION_TTL = 3600              # seconds an untouched session stays cached
+
+# compiled once: strptime re-resolves its format string on every call
+_TIME_RE = re.compile(r'^([01]?\d|2[0-3]):([0-5]\d)$')
+_DOM = frozenset(range(1, 32))
+
+# message key per configured event type; module-level so the callback
+# handler does not rebuild the mapping on every click
+_EVENT_TYPE_MESSAGES = {
+    EventType.REPLENISHMENT: ("config", "replenishment"),
+    EventType.ANNULMENT: ("config", "annulment"),
+    EventType.REMINDER: ("config", "reminder"),
+}
+
+
+class RateLimiter:
+    """
+    Client-side pacing against Telegram's published limits. Each send
+    reserves the next free slot on a global and a per-chat leaky bucket
+    and sleeps until it, so bursts are smoothed up front instead of
+    stalling in 429 retry-backoff after the fact
+    """
+
+    def __init__(self, global_rate: int = GLOBAL_SEND_RATE, per_chat_interval: float = PER_CHAT_SEND_INTERVAL):
+        self._global_interval = 1.0 / global_rate
+        self._per_chat_interval = per_chat_interval
+        self._next_global = 0.0
+        self._next_per_chat: dict[int, float] = {}
+        self._next_purge = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, chat_id: int) -> None:
+        async with self._lock:
+            now = monotonic()
+            if now >= self._next_purge:
+                # a slot in the past constrains nothing anymore: sweeping
+                # those entries keeps the dict from growing one float per
+                # chat ever messaged
+                self._next_per_chat = {
+                    cid: slot for cid, slot in self._next_per_chat.items() if slot > now
+                }
+                self._next_purge = now + SLOT_PURGE_INTERVAL
+            slot = max(now, self._next_global, self._next_per_chat.get(chat_id, 0.0))
+            self._next_global = slot + self._global_interval
+            self._next_per_chat[chat_id] = slot + self._per_chat_interval
+        if (delay := slot - monotonic()) > 0:
+            await asyncio.sleep(delay)
+
+
 class CurrentHandler(Enum):
     EVENT_TYPE = "EVENT_TYPE"
     BASIS = "BASIS"
@@ -24,247 +85,329 @@ class CurrentHandler(Enum):
     ON_DUTY = "ON_DUTY"
 
 
-class Bot:
-    managers: dict[int, ChatManager] = {}
-    configs: dict[int, ScheduleEntry] = {}
-    current_handlers: dict[int: CurrentHandler] = {}
+@dataclass(slots=True)
+class ChatSession:
+    """
+    All of one chat's in-memory state. Keeping it in a single object means
+    one dict lookup per update instead of three parallel dicts hashed on
+    the same chat_id, and one allocation per new chat
+    """
+    manager: ChatManager | None = None
+    config: ScheduleEntry | None = None
+    handler: CurrentHandler = CurrentHandler.EVENT_TYPE
 
-    def __init__(self, token):
-        self.telebot = telebot.TeleBot(token)
 
-        self.text_handlers_map = {
-            CurrentHandler.ON_DUTY: self.handle_message,
-            CurrentHandler.DAY_OF_THE_MONTH: self.handle_config_day_of_the_month,
-            CurrentHandler.TIME: self.handle_config_time,
+class Bot:
+    def __init__(self, token):
+        self.telebot = AsyncTeleBot(token)
+        self._rate_limiter = RateLimiter()
+        # the running event loop, captured by listen_and_process: worker
+        # threads ship coroutines onto it with run_coroutine_threadsafe
+        self.loop: asyncio.AbstractEventLoop | None = None
+
+        # per-instance, not class-level: class-scope state would be shared
+        # by every Bot (and Mocker) instance and outlive all of them.
+        # The TTL cache evicts sessions of chats that went quiet, so RSS
+        # stays bounded over the bot's lifetime; the update handlers route
+        # an evicted chat back through handle_first_contact
+        self.sessions: TTLCache[int, ChatSession] = TTLCache(maxsize=MAX_SESSIONS, ttl=SESSION_TTL)
+
+        # one fused dispatch table instead of separate text/button maps:
+        # a single hash lookup routes an update, with the bound methods
+        # resolved once here rather than per message
+        self._dispatch = {
+            ("text", CurrentHandler.ON_DUTY): self.handle_message,
+            ("text", CurrentHandler.DAY_OF_THE_MONTH): self.handle_config_day_of_the_month,
+            ("text", CurrentHandler.TIME): self.handle_config_time,
+            ("callback", CurrentHandler.EVENT_TYPE): self.handle_config_event_type,
+            ("callback", CurrentHandler.BASIS): self.handle_config_basis,
+            ("callback", CurrentHandler.DAY_OF_THE_WEEK): self.handle_config_day_of_the_week,
         }
 
-        self.button_handlers_map = {
-            CurrentHandler.EVENT_TYPE: self.handle_config_event_type,
-            CurrentHandler.BASIS: self.handle_config_basis,
-            CurrentHandler.DAY_OF_THE_WEEK: self.handle_config_day_of_the_week,
+        # basis → (next state, prompt) transition table: the data was
+        # compile-time-known, but lived in a match statement re-scanned on
+        # every callback
+        self._basis_next = {
+            ScheduleBasis.DAILY: (CurrentHandler.TIME, self.request_config_time),
+            ScheduleBasis.DAY_OF_THE_WEEK: (CurrentHandler.DAY_OF_THE_WEEK, self.request_config_day_of_the_week),
+            ScheduleBasis.DAY_OF_THE_MONTH: (CurrentHandler.DAY_OF_THE_MONTH, self.request_config_day_of_the_month),
         }
 
-    def listen_and_process(self):
+        # the button menus never change at runtime: built once here instead
+        # of being reallocated on every config round trip.
+        # telebot re-serializes a markup object on every send, while a raw
+        # JSON string passes through its markup conversion untouched — so the
+        # static menus are serialized here exactly once
+        self._config_menu_markup_json = self._build_markup([
+            ("T", EventType.REPLENISHMENT),
+            ("A", EventType.ANNULMENT),
+            ("R", EventType.REMINDER),
+            ("DONE", config_finished),
+        ]).to_json()
+        self._basis_markup_json = self._build_markup([
+            ("D", ScheduleBasis.DAILY),
+            ("W", ScheduleBasis.DAY_OF_THE_WEEK),
+            ("M", ScheduleBasis.DAY_OF_THE_MONTH),
+        ]).to_json()
+        self._dow_markup_json = self._build_markup([
+            ("MON", DayOfTheWeek.MONDAY),
+            ("TUE", DayOfTheWeek.TUESDAY),
+            ("WED", DayOfTheWeek.WEDNESDAY),
+            ("THU", DayOfTheWeek.THURSDAY),
+            ("FRI", DayOfTheWeek.FRIDAY),
+            ("SAT", DayOfTheWeek.SATURDAY),
+            ("SUN", DayOfTheWeek.SUNDAY),
+        ]).to_json()
+
+    async def _send(self, chat_id, text, reply_markup=None):
+        """Every outbound message funnels through here to respect the rate limits"""
+        await self._rate_limiter.acquire(chat_id)
+        await self.telebot.send_message(chat_id=chat_id, text=text, reply_markup=reply_markup)
+
+    @staticmethod
+    def _build_markup(buttons) -> telebot.types.InlineKeyboardMarkup:
+        markup = telebot.types.InlineKeyboardMarkup()
+        for text, data in buttons:
+            markup.add(telebot.types.InlineKeyboardButton(text=text, callback_data=data))
+        return markup
+
+    async def listen_and_process(self):
         """
         This method initializes the bot's message handlers,
         representing its main loop, it listens to incoming messages and events.
         The decorators are used to associate each func with a trigger,
         that launches its execution.
+        Handlers are coroutines on the async telebot, so outbound sends overlap
+        instead of stacking one network round-trip after another.
+        With WEBHOOK_URL configured, Telegram pushes updates to the bot and
+        no getUpdates polling traffic is spent while the bot sits idle;
+        otherwise the bot falls back to long-polling.
         https://github.com/eternnoir/pyTelegramBotAPI?tab=readme-ov-file#message-handlers
         """
 
+        self.loop = asyncio.get_running_loop()
+
+        # bound as closure locals once: the handlers below run for every
+        # update, and a local read is cheaper than self-attribute traversal
+        sessions = self.sessions
+        dispatch = self._dispatch
+
         @self.telebot.message_handler(commands=['start'])
-        def first_contact(message):
-            self.handle_first_contact(message)
+        async def first_contact(message):
+            await self.handle_first_contact(message)
 
         @self.telebot.message_handler(content_types=['text'])
-        def handle_text(message) -> None:
-            current_handler: CurrentHandler = self.current_handlers[message.chat.id]
-            self.text_handlers_map[current_handler](message)        # TODO
+        async def handle_text(message) -> None:
+            session = sessions.get(message.chat.id)
+            if session is None:
+                # unknown or TTL-evicted chat: restart it from the top
+                # instead of dropping the update on the floor
+                await self.handle_first_contact(message)
+                return
+            await dispatch[("text", session.handler)](message)        # TODO
 
         @self.telebot.callback_query_handler(func=lambda call: True)
-        def configure(call):
-            current_handler: CurrentHandler = self.current_handlers[call.message.chat.id]
-            self.button_handlers_map[current_handler](call)         # TODO
-
-    def handle_first_contact(self, message):
+        async def configure(call):
+            session = sessions.get(call.message.chat.id)
+            if session is None:
+                await self.handle_first_contact(call.message)
+                return
+            await dispatch[("callback", session.handler)](call)       # TODO
+
+        if config.WEBHOOK_URL:
+            await self.serve_webhook()
+        else:
+            await self.telebot.polling()
+
+    async def serve_webhook(self):
+        """
+        Registers the webhook with Telegram and serves it with aiohttp.
+        The POST route feeds the received updates into the same dispatch
+        the polling mode uses.
+        """
+        await self.telebot.remove_webhook()
+        await self.telebot.set_webhook(url=config.WEBHOOK_URL)
+
+        async def receive_update(request):
+            update = telebot.types.Update.de_json(await request.json())
+            await self.telebot.process_new_updates([update])
+            return web.Response()
+
+        app = web.Application()
+        app.router.add_post("/", receive_update)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "0.0.0.0", config.WEBHOOK_PORT)
+        await site.start()
+        logger.info(f"Webhook registered at {config.WEBHOOK_URL}. Serving on port {config.WEBHOOK_PORT}.")
+        await asyncio.Event().wait()
+
+    async def handle_first_contact(self, message):
         chat_id = message.chat.id
 
-        self.telebot.send_message(
-            chat_id=chat_id,
-            text=service_keeper.get_message("first_contact", "welcome"),
-        )
-        self.telebot.send_message(
-            chat_id=chat_id,
-            text=service_keeper.get_message("first_contact", "overview"),
-        )
-        self.telebot.send_message(
-            chat_id=chat_id,
-            text=service_keeper.get_message("config", "intro"),
-        )
+        # the welcome texts and the config menu travel as one message with
+        # the keyboard attached: a single HTTP round-trip, and one outbound
+        # request against the rate cap, instead of four
+        text = "\n\n".join((
+            _msg("first_contact", "welcome"),
+            _msg("first_contact", "overview"),
+            _msg("config", "intro"),
+            _msg("config", "menu"),
+        ))
+        await self._send(chat_id=chat_id, text=text, reply_markup=self._config_menu_markup_json)
         logger.info(f"First contact with {chat_id=}. Anticipating config.")
-        self.send_config_menu(chat_id)
-        self.current_handlers[chat_id] = CurrentHandler.EVENT_TYPE
+        # setdefault keeps the manager of a chat that restarts mid-flow
+        session = self.sessions.setdefault(chat_id, ChatSession())
+        session.handler = CurrentHandler.EVENT_TYPE
 
-    def handle_config_event_type(self, call):
+    async def handle_config_event_type(self, call):
         """
         All the config methods together loop up from and to this method
         until the config_finished sentinel value is received.
         """
         chat_id = call.message.chat.id
+        session = self.sessions[chat_id]
 
-        if call.data is config_finished:
-            state = self.managers[chat_id].get_state()
+        if call.data == config_finished:
+            state = session.manager.get_state()
             match state:
                 case State.INITIAL:
-                    self.telebot.send_message(
+                    await self._send(
                         chat_id=chat_id,
-                        text=service_keeper.get_message("config", "not_configured"),
+                        text=_msg("config", "not_configured"),
                     )
-                    self.current_handlers[chat_id] = CurrentHandler.EVENT_TYPE
-                    self.send_config_menu(chat_id)
+                    session.handler = CurrentHandler.EVENT_TYPE
+                    await self.send_config_menu(chat_id)
                 case State.TERMINATED:
-                    self.telebot.send_message(
+                    await self._send(
                         chat_id=chat_id,
-                        text=service_keeper.get_message("config", "not_configured"),
+                        text=_msg("config", "not_configured"),
                     )
                 case State.CONFIGURED:
-                    self.telebot.send_message(
+                    await self._send(
                         chat_id=chat_id,
-                        text=service_keeper.get_message("config", "success"),
+                        text=_msg("config", "success"),
                     )
-                    self.current_handlers[chat_id] = CurrentHandler.ON_DUTY
+                    session.handler = CurrentHandler.ON_DUTY
                     logger.info(
                         f"The configuration of the chat with {chat_id=} has been finished. "
                         f"Switched to {CurrentHandler.ON_DUTY.value} handler."
                     )
-                    return
-
-        self.configs[chat_id] = ScheduleEntry(event_type=call.data)
-        self.telebot.send_message(
-            chat_id=chat_id,
-            text=service_keeper.get_message(
-                *{
-                    EventType.REPLENISHMENT: ("config", "replenishment"),
-                    EventType.ANNULMENT: ("config", "annulment"),
-                    EventType.REMINDER: ("config", "reminder"),
-                }[call.data]
-            ),
-        )
-        self.current_handlers[chat_id] = CurrentHandler.BASIS
-        self.request_config_basis(chat_id)
-
-    def handle_config_basis(self, call):
+            return
+
+        session.config = ScheduleEntry(event_type=call.data)
+        # the type confirmation carries the basis keyboard directly, so the
+        # step costs one outbound message instead of two
+        text = "\n\n".join((
+            _msg(*_EVENT_TYPE_MESSAGES[call.data]),
+            _msg("config", "basis"),
+        ))
+        session.handler = CurrentHandler.BASIS
+        await self._send(chat_id=chat_id, text=text, reply_markup=self._basis_markup_json)
+
+    async def handle_config_basis(self, call):
         chat_id = call.message.chat.id
+        session = self.sessions[chat_id]
         basis = call.data   # type: ScheduleBasis
-        self.configs[chat_id].basis = basis
-        match basis:
-            case ScheduleBasis.DAILY:
-                self.current_handlers[chat_id] = CurrentHandler.TIME
-                self.request_config_time(chat_id)
-            case ScheduleBasis.DAY_OF_THE_WEEK:
-                self.current_handlers[chat_id] = CurrentHandler.DAY_OF_THE_WEEK
-                self.request_config_day_of_the_week(chat_id)
-            case ScheduleBasis.DAY_OF_THE_MONTH:
-                self.current_handlers[chat_id] = CurrentHandler.DAY_OF_THE_MONTH
-                self.request_config_day_of_the_month(chat_id)
-
-    def handle_config_day_of_the_week(self, call):
+        session.config.basis = basis
+        next_handler, request_input = self._basis_next[basis]
+        session.handler = next_handler
+        await request_input(chat_id)
+
+    async def handle_config_day_of_the_week(self, call):
         chat_id = call.message.chat.id
-        self.configs[chat_id].day = call.data   # type: DayOfTheWeek
-        self.current_handlers[chat_id] = CurrentHandler.TIME
-        self.request_config_time(chat_id)
+        session = self.sessions[chat_id]
+        session.config.day = call.data   # type: DayOfTheWeek
+        session.handler = CurrentHandler.TIME
+        await self.request_config_time(chat_id)
 
-    def handle_config_day_of_the_month(self, message):
+    async def handle_config_day_of_the_month(self, message):
         chat_id = message.chat.id
-        try:
-            day = int(message.text)
-            assert 1 <= day <= 31
-            self.configs[chat_id].day = day
-            self.current_handlers[chat_id] = CurrentHandler.TIME
-            self.request_config_time(chat_id)
-        except (ValueError, AssertionError):
-            self.request_config_day_of_the_month(chat_id, repeated=True)
-
-    def handle_config_time(self, message):
+        session = self.sessions[chat_id]
+        # plain checks instead of exception-driven control flow: a typo no
+        # longer costs a raise and a stack unwind. isdecimal, not isdigit:
+        # the latter accepts characters like superscripts that int() rejects
+        text = message.text
+        if not text.isdecimal() or int(text) not in _DOM:
+            await self.request_config_day_of_the_month(chat_id, repeated=True)
+            return
+        session.config.day = int(text)
+        session.handler = CurrentHandler.TIME
+        await self.request_config_time(chat_id)
+
+    async def handle_config_time(self, message):
         chat_id = message.chat.id
+        session = self.sessions[chat_id]
         time_str = message.text
-        try:
-            self.configs[chat_id].time = datetime.strptime(time_str, '%H:%M').time()
-        except ValueError:
-            self.request_config_time(chat_id, repeated=True)
-
-        chat_manager = self.managers.get(chat_id)
-        if chat_manager is None:
+        match = _TIME_RE.match(time_str)
+        if not match:
+            await self.request_config_time(chat_id, repeated=True)
+            return
+        session.config.time = time(int(match[1]), int(match[2]))
+
+        chat_manager = session.manager
+        first_config = chat_manager is None
+        if first_config:
             chat_manager = ChatManager(chat_id=chat_id)
-            chat_manager.engage(Decimal(1000), Decimal(1000))
-            self.managers[chat_id] = chat_manager
-        schedule_entry = self.configs.pop(chat_id)
-        chat_manager.scheduler.schedule_crontab_task(record=schedule_entry)
-        chat_manager.refresh_latest_contact()
-        if schedule_entry.event_type == EventType.REPLENISHMENT:
-            chat_manager.set_configured()
-        elif schedule_entry.event_type == EventType.REMINDER:
-            chat_manager.engage_reminder()
-        self.send_config_menu(chat_id)
-        self.current_handlers[chat_id] = CurrentHandler.EVENT_TYPE
-
-    def handle_message(self, message):
+            session.manager = chat_manager
+        schedule_entry, session.config = session.config, None
+        # the whole step runs as one core-db transaction: engage and
+        # set_configured flush inside the block and commit once on exit,
+        # instead of paying a commit fsync per method
+        with chat_manager:
+            if first_config:
+                chat_manager.engage(Decimal(1000))
+            chat_manager.scheduler.schedule_crontab_task(record=schedule_entry)
+            chat_manager.refresh_latest_contact()
+            if schedule_entry.event_type == EventType.REPLENISHMENT:
+                chat_manager.set_configured()
+            elif schedule_entry.event_type == EventType.REMINDER:
+                chat_manager.engage_reminder()
+        await self.send_config_menu(chat_id)
+        session.handler = CurrentHandler.EVENT_TYPE
+
+    async def handle_message(self, message):
         # TODO set chat's reminder_silenced to True
         # TODO refresh_latest_contact for the Chat
         ...
 
-    def send_config_menu(self, chat_id):
-        markup = telebot.types.InlineKeyboardMarkup()
-        buttons = [
-            ("T", EventType.REPLENISHMENT),
-            ("A", EventType.ANNULMENT),
-            ("R", EventType.REMINDER),
-            ("DONE", config_finished),
-        ]
-        for button in buttons:
-            markup.add(telebot.types.InlineKeyboardButton(button))
-
-        self.telebot.send_message(
+    async def send_config_menu(self, chat_id):
+        await self._send(
             chat_id=chat_id,
-            text=service_keeper.get_message("config", "menu"),
-            reply_markup=markup,
+            text=_msg("config", "menu"),
+            reply_markup=self._config_menu_markup_json,
         )
 
-    def request_config_basis(self, chat_id):
-        markup = telebot.types.InlineKeyboardMarkup()
-        buttons = [
-            ("D", ScheduleBasis.DAILY),
-            ("W", ScheduleBasis.DAY_OF_THE_WEEK),
-            ("M", ScheduleBasis.DAY_OF_THE_MONTH),
-        ]
-        for button in buttons:
-            markup.add(telebot.types.InlineKeyboardButton(button))
-
-        self.telebot.send_message(
+    async def request_config_basis(self, chat_id):
+        await self._send(
             chat_id=chat_id,
-            text=service_keeper.get_message("config", "basis"),
-            reply_markup=markup
+            text=_msg("config", "basis"),
+            reply_markup=self._basis_markup_json
         )
 
-    def request_config_day_of_the_week(self, chat_id):
-        markup = telebot.types.InlineKeyboardMarkup()
-        buttons = [
-            ("MON", DayOfTheWeek.MONDAY),
-            ("TUE", DayOfTheWeek.TUESDAY),
-            ("WED", DayOfTheWeek.WEDNESDAY),
-            ("THU", DayOfTheWeek.THURSDAY),
-            ("FRI", DayOfTheWeek.FRIDAY),
-            ("SAT", DayOfTheWeek.SATURDAY),
-            ("SUN", DayOfTheWeek.SUNDAY),
-        ]
-        for button in buttons:
-            markup.add(telebot.types.InlineKeyboardButton(button))
-
-        self.telebot.send_message(
+    async def request_config_day_of_the_week(self, chat_id):
+        await self._send(
             chat_id=chat_id,
-            text=service_keeper.get_message("config", "day_of_the_week"),
-            reply_markup=markup
+            text=_msg("config", "day_of_the_week"),
+            reply_markup=self._dow_markup_json
         )
 
-    def request_config_day_of_the_month(self, chat_id, repeated=False):
-        self.telebot.send_message(
+    async def request_config_day_of_the_month(self, chat_id, repeated=False):
+        await self._send(
             chat_id=chat_id,
             text=(
-                service_keeper.get_message("config", "day_of_the_month_wrong_input")
+                _msg("config", "day_of_the_month_wrong_input")
                 if repeated
-                else service_keeper.get_message("config", "day_of_the_month")
+                else _msg("config", "day_of_the_month")
             ),
         )
 
-    def request_config_time(self, chat_id, repeated=False):
-        self.telebot.send_message(
+    async def request_config_time(self, chat_id, repeated=False):
+        await self._send(
             chat_id=chat_id,
             text=(
-                service_keeper.get_message("config", "time_wrong_input")
+                _msg("config", "time_wrong_input")
                 if repeated
-                else service_keeper.get_message("config", "time")
+                else _msg("config", "time")
             ),
         )
-
-
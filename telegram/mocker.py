@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import traceback
 from random import randrange
 from typing import Any, Callable, Optional
 
 import telebot  # noqa
+from telebot.async_telebot import AsyncTeleBot
 
 # Project
 from core.models import EventType, DayOfTheWeek, ScheduleBasis
@@ -14,6 +16,22 @@ from telegram.utils import config_finished
 
 logger = logging.getLogger(__name__)
 
+# input→value lookups built once at module load; deriving the weekday map
+# from the enum removes the hand-typed duplication that had mis-mapped
+# thu/fri/sat/sun
+_ETYPE = {
+    "t": EventType.REPLENISHMENT,
+    "a": EventType.ANNULMENT,
+    "r": EventType.REMINDER,
+    "done": config_finished,
+}
+_BASIS = {
+    "d": ScheduleBasis.DAILY,
+    "w": ScheduleBasis.DAY_OF_THE_WEEK,
+    "m": ScheduleBasis.DAY_OF_THE_MONTH,
+}
+_DOW = {day.name[:3].lower(): day for day in DayOfTheWeek}
+
 
 class MockChat:
     """Mock Chat, used within the MockMessage only"""
@@ -38,17 +56,17 @@ class MockCall:
         self.data = data
 
 
-class MockTeleBot(telebot.TeleBot):
+class MockTeleBot(AsyncTeleBot):
     """
     Dummy class for mocking the telebot from pytelegrambotapi.
-    Inherits from the original TeleBot for the typing purposes only.
+    Inherits from the original AsyncTeleBot for the typing purposes only.
     Fully overrides relevant methods with mock implementation.
     """
 
     def __init__(self): # noqa
         pass
 
-    def send_message(self, *args, chat_id: int, text: str, **kwargs):
+    async def send_message(self, *args, chat_id: int, text: str, **kwargs):
         print(text)
 
 
@@ -58,7 +76,8 @@ class Mocker(Bot):
     and is designed to test the rest of the app in isolation from telegram
     """
 
-    def __init__(self):         # noqa
+    def __init__(self):
+        super().__init__(token=None)
         self.chat_id = randrange(1, 100000)
         self.telebot = MockTeleBot()
         self.handler_triggers = {
@@ -80,62 +99,50 @@ class Mocker(Bot):
         call = MockCall(message=message, data=data)
         return call
 
-    def start(self, user_input):
+    async def start(self, user_input):
         if user_input == "start":
-            self.handle_first_contact(self._mock_message())
+            await self.handle_first_contact(self._mock_message())
             print("[Mocker] Use 'T', 'A', 'R', to config a new event type, 'done' to finish config")
 
-    def config_event_type(self, user_input):
-        data = {
-            "t": EventType.REPLENISHMENT,
-            "a": EventType.ANNULMENT,
-            "r": EventType.REMINDER,
-            "done": config_finished,
-        }.get(user_input, user_input)
-        self.handle_config_event_type(self._mock_call(data=data))
-
-    def config_basis(self, user_input):
-        data = {
-            "d": ScheduleBasis.DAILY,
-            "w": ScheduleBasis.DAY_OF_THE_WEEK,
-            "m": ScheduleBasis.DAY_OF_THE_MONTH,
-        }.get(user_input, user_input)
-        self.handle_config_basis(self._mock_call(data=data))
+    async def config_event_type(self, user_input):
+        data = _ETYPE.get(user_input, user_input)
+        await self.handle_config_event_type(self._mock_call(data=data))
+
+    async def config_basis(self, user_input):
+        data = _BASIS.get(user_input, user_input)
+        await self.handle_config_basis(self._mock_call(data=data))
         if data == ScheduleBasis.DAY_OF_THE_WEEK:
             print("[Mocker] Use one of: 'mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun'")
 
-    def config_day_of_the_week(self, user_input):
-        data = {
-            "mon": DayOfTheWeek.MONDAY,
-            "tue": DayOfTheWeek.TUESDAY,
-            "wed": DayOfTheWeek.WEDNESDAY,
-            "thu": DayOfTheWeek.MONDAY,
-            "fri": DayOfTheWeek.TUESDAY,
-            "sat": DayOfTheWeek.WEDNESDAY,
-            "sun": DayOfTheWeek.WEDNESDAY,
-        }.get(user_input, user_input)
-        self.handle_config_day_of_the_week(self._mock_call(data=data))
-
-    def config_day_of_the_month(self, user_input):
-        self.handle_config_day_of_the_month(self._mock_message(text=user_input))
-
-    def config_time(self, user_input):
-        self.handle_config_time(self._mock_message(text=user_input))
-
-    def listen_and_process(self):
+    async def config_day_of_the_week(self, user_input):
+        data = _DOW.get(user_input, user_input)
+        await self.handle_config_day_of_the_week(self._mock_call(data=data))
+
+    async def config_day_of_the_month(self, user_input):
+        await self.handle_config_day_of_the_month(self._mock_message(text=user_input))
+
+    async def config_time(self, user_input):
+        await self.handle_config_time(self._mock_message(text=user_input))
+
+    async def listen_and_process(self):
         """
         Mocker's listen_and_process method imitates the work of the Bot's listen_and_process method.
         It listens to user input in a loop, like the bot is listening to events or messages.
+        The blocking input() runs in a worker thread, so the event loop stays
+        free and several Mocker instances can be driven concurrently.
         """
+        self.loop = asyncio.get_running_loop()
         print("[Mocker] Telegram Mocker is running. Type anything to sim the first contact. Type 'exit' to quit.")
         while True:
             try:
-                command = input("[Mocker] Enter command: ").casefold().strip()
+                command = (await asyncio.to_thread(input, "[Mocker] Enter command: ")).casefold().strip()
                 if command == 'exit':
                     break
-                current_handler: CurrentHandler = self.current_handlers.get(self.chat_id)
-                handler_trigger: Optional[Callable] = self.handler_triggers.get(current_handler)
-                (handler_trigger or self.start)(command)
+                session = self.sessions.get(self.chat_id)
+                handler_trigger: Optional[Callable] = (
+                    self.handler_triggers.get(session.handler) if session else None
+                )
+                await (handler_trigger or self.start)(command)
             except Exception as e:
                 print(f"[Mocker][Error] {type(e).__name__}: {e}")
 
@@ -1,7 +1,55 @@
-class ConfigFinishedSignal:
-    """A sentinel class for the bot to pass a signal, that the user intends to mark his configuration finished"""
-    pass
+import logging
 
+# Project
+from core.managers import service_keeper
 
-config_finished = ConfigFinishedSignal()
+logger = logging.getLogger(__name__)
 
+
+# A sentinel value for the bot to pass a signal, that the user intends to
+# mark his configuration finished. A plain string, because Telegram round-trips
+# callback_data as text: an object sentinel compared by identity could never
+# match what actually comes back in the callback
+config_finished = "__done__"
+
+# every (section, key) pair the handlers read; used to pre-warm the cache
+_KNOWN_MESSAGES = (
+    ("first_contact", "welcome"),
+    ("first_contact", "overview"),
+    ("config", "intro"),
+    ("config", "menu"),
+    ("config", "replenishment"),
+    ("config", "annulment"),
+    ("config", "reminder"),
+    ("config", "basis"),
+    ("config", "day_of_the_week"),
+    ("config", "day_of_the_month"),
+    ("config", "day_of_the_month_wrong_input"),
+    ("config", "time"),
+    ("config", "time_wrong_input"),
+    ("config", "not_configured"),
+    ("config", "success"),
+)
+
+
+def _msg(section: str, key: str) -> str:
+    """
+    Short alias for the keeper lookup. The keeper's TTL cache already makes
+    repeat hits a dict access, while still letting reload_messages_task
+    reach users within the TTL window — no extra cache layer on top
+    """
+    return service_keeper.get_message(section, key)
+
+
+def warm_messages() -> None:
+    """
+    Pre-fills the keeper's message cache with the handler texts.
+    Called from the app entrypoint, never at import time
+    """
+    for section, key in _KNOWN_MESSAGES:
+        try:
+            _msg(section, key)
+        except Exception as e:
+            # tolerated: the messages are fetched lazily on first use instead
+            logger.warning(f"Couldn't pre-warm message {section=}, {key=}.\nException: {e}")
+            break